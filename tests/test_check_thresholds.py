@@ -7,9 +7,35 @@ Tests the QC metric validation functionality.
 import json
 import tempfile
 import unittest
+import zipfile
+from pathlib import Path
 from unittest.mock import patch
 
 
+def _fastqc_data(total=150000, gc=50.0, adapter_max=2.0):
+    """Build a minimal fastqc_data.txt with the sections the parser reads."""
+    lines = [
+        "##FastQC\t0.11.9",
+        ">>Basic Statistics\tpass",
+        "#Measure\tValue",
+        f"Total Sequences\t{total}",
+        f"%GC\t{gc}",
+        ">>END_MODULE",
+        ">>Adapter Content\tpass",
+        "#Position\tIllumina Universal Adapter",
+        "1\t0.5",
+        f"2\t{adapter_max}",
+        ">>END_MODULE",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _write_fastqc_zip(zip_path, sample, **kwargs):
+    """Create a synthetic per-sample FastQC zip at zip_path."""
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(f"{sample}_fastqc/fastqc_data.txt", _fastqc_data(**kwargs))
+
+
 class TestParseArgs(unittest.TestCase):
     """Test argument parsing."""
 
@@ -133,6 +159,123 @@ class TestFastqcMetricsValidation(unittest.TestCase):
         self.assertTrue(any("gc" in r.lower() for r in reasons))
 
 
+class TestParseFastqc(unittest.TestCase):
+    """Test metric extraction from FastQC archives."""
+
+    def test_parse_fastqc_zip_roundtrip(self):
+        """Test parsing a synthetic per-sample FastQC zip."""
+        from bin.check_thresholds import parse_fastqc_zip
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            zip_path = Path(tmpdir) / "sampleX_fastqc.zip"
+            _write_fastqc_zip(zip_path, "sampleX", total=123456, gc=43.0, adapter_max=7.5)
+            metrics = parse_fastqc_zip(zip_path)
+
+        self.assertEqual(metrics["sample"], "sampleX")
+        self.assertEqual(metrics["total_sequences"], 123456)
+        self.assertEqual(metrics["gc_content"], 43.0)
+        self.assertAlmostEqual(metrics["adapter_content_max"], 7.5)
+
+    def test_parse_fastqc_tree_bundle(self):
+        """Test parsing a combined archive holding several reports."""
+        from bin.check_thresholds import parse_fastqc_tree
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bundle = Path(tmpdir) / "all_fastqc.zip"
+            with zipfile.ZipFile(bundle, "w", zipfile.ZIP_DEFLATED) as zf:
+                zf.writestr(
+                    "s1_fastqc/fastqc_data.txt",
+                    _fastqc_data(total=1000, gc=40.0, adapter_max=1.0),
+                )
+                zf.writestr(
+                    "s2_fastqc/fastqc_data.txt",
+                    _fastqc_data(total=2000, gc=60.0, adapter_max=3.0),
+                )
+            results = parse_fastqc_tree(bundle)
+
+        self.assertEqual(set(results), {"s1", "s2"})
+        self.assertEqual(results["s1"]["total_sequences"], 1000)
+        self.assertEqual(results["s1"]["gc_content"], 40.0)
+        self.assertAlmostEqual(results["s1"]["adapter_content_max"], 1.0)
+        self.assertEqual(results["s2"]["total_sequences"], 2000)
+        self.assertAlmostEqual(results["s2"]["adapter_content_max"], 3.0)
+
+
+class TestMetricsCache(unittest.TestCase):
+    """Test the --cache sidecar used by main()."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        root = Path(self.tmpdir.name)
+        self.fastqc_dir = root / "fastqc"
+        self.fastqc_dir.mkdir()
+        self.zip_path = self.fastqc_dir / "sample1_fastqc.zip"
+        _write_fastqc_zip(self.zip_path, "sample1", total=150000)
+        self.config = root / "thresholds.ini"
+        self.config.write_text("[thresholds]\nmin_reads = 100000\n")
+        self.output = root / "qc_summary.json"
+        self.cache = root / "cache.json"
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _run_main(self):
+        from bin.check_thresholds import main
+
+        argv = [
+            "check_thresholds.py",
+            "--fastqc-dir",
+            str(self.fastqc_dir),
+            "--config",
+            str(self.config),
+            "--output",
+            str(self.output),
+            "--cache",
+            str(self.cache),
+        ]
+        with patch("sys.argv", argv):
+            main()
+        return json.loads(self.output.read_text(encoding="utf-8"))
+
+    def test_cache_hit_skips_parsing(self):
+        """Test that an unchanged zip is served from the cache."""
+        import bin.check_thresholds as check_thresholds
+
+        self._run_main()
+        with patch.object(
+            check_thresholds,
+            "parse_fastqc_zip",
+            side_effect=AssertionError("cached zip was re-parsed"),
+        ):
+            results = self._run_main()
+        self.assertEqual(results["sample1"]["status"], "PASS")
+        self.assertEqual(results["sample1"]["total_sequences"], 150000)
+
+    def test_cache_invalidated_on_zip_change(self):
+        """Test that a regenerated zip misses the cache."""
+        self._run_main()
+        _write_fastqc_zip(self.zip_path, "sample1", total=50000)
+
+        results = self._run_main()
+        self.assertEqual(results["sample1"]["total_sequences"], 50000)
+        self.assertEqual(results["sample1"]["status"], "FAIL")
+
+    def test_corrupt_cache_file_recovered(self):
+        """Test that a corrupt cache file is ignored and rewritten."""
+        self.cache.write_text("{not json")
+
+        results = self._run_main()
+        self.assertEqual(results["sample1"]["status"], "PASS")
+
+        reloaded = json.loads(self.cache.read_text(encoding="utf-8"))
+        self.assertEqual(len(reloaded), 1)
+        entry = next(iter(reloaded.values()))
+        self.assertEqual(entry["total_sequences"], 150000)
+        # the sidecar stores parser output only, never checked status
+        self.assertNotIn("status", entry)
+        self.assertNotIn("reasons", entry)
+
+
 class TestQCSummary(unittest.TestCase):
     """Test QC summary generation."""
 